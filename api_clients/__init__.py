@@ -1,14 +1,21 @@
-from .openai import OpenAIClient
-from .google import GoogleClient
-from .anthropic import AnthropicClient
+from functools import lru_cache
 
 
 def get_client(provider: str, model_name: str):
-    provider = provider.lower()
+    return _get_client(provider.lower(), model_name)
+
+
+# Nodes sharing (provider, model) share one client and its connection pool
+@lru_cache(maxsize=None)
+def _get_client(provider: str, model_name: str):
+    # Provider SDKs are heavy: only import the one actually requested
     if provider in ('openai',):
+        from .openai import OpenAIClient
         return OpenAIClient(model_name)
     if provider in ('google', 'palm'):
+        from .google import GoogleClient
         return GoogleClient(model_name)
     if provider in ('anthropic', 'claude'):
+        from .anthropic import AnthropicClient
         return AnthropicClient(model_name)
     raise ValueError(f"Provider inconnu: {provider}")
@@ -0,0 +1,77 @@
+import asyncio
+import importlib
+from threading import Lock
+from typing import Any, Dict, Tuple
+
+from .base_client import BaseClient
+
+# SDK retries kept on the calls retry_llm cannot wrap (streams, Batch API files and polling)
+SDK_MAX_RETRIES = 2
+
+
+class ClientPool:
+    """
+    Shares the SDK clients of one provider, and so their keep-alive connection pools.
+
+    One sync client per API key. Async clients are bound to the event loop their
+    connections were opened on, so there is one per (API key, loop): generate_many
+    runs a new loop on each call. SDK retries are disabled on both, retry_llm owns
+    the retry policy of generate/agenerate.
+
+    The SDK (openai, anthropic: same client layout) is imported on first use, so
+    that importing owl does not pay for it.
+    """
+    def __init__(self, module: str, sync_class: str, async_class: str):
+        self.module = module
+        self.sync_class = sync_class
+        self.async_class = async_class
+        self._clients: Dict[str, Any] = {}
+        self._async_clients: Dict[Tuple[str, asyncio.AbstractEventLoop], Any] = {}
+        self._lock = Lock()
+
+    def _build(self, class_name: str, http_client_name: str, api_key: str) -> Any:
+        import httpx
+        sdk = importlib.import_module(self.module)
+        limits = httpx.Limits(max_keepalive_connections=64, max_connections=256)
+        return getattr(sdk, class_name)(
+            api_key=api_key, max_retries=0, http_client=getattr(sdk, http_client_name)(limits=limits)
+        )
+
+    def client(self, api_key: str) -> Any:
+        with self._lock:
+            if api_key not in self._clients:
+                self._clients[api_key] = self._build(self.sync_class, 'DefaultHttpxClient', api_key)
+            return self._clients[api_key]
+
+    def async_client(self, api_key: str) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # drop clients of finished loops (their pools cannot be reused)
+            for key in [key for key in self._async_clients if key[1].is_closed()]:
+                del self._async_clients[key]
+            if (api_key, loop) not in self._async_clients:
+                self._async_clients[(api_key, loop)] = self._build(
+                    self.async_class, 'DefaultAsyncHttpxClient', api_key
+                )
+            return self._async_clients[(api_key, loop)]
+
+
+class PooledClient(BaseClient):
+    """
+    Base for the clients whose SDK connections are shared through a ClientPool.
+    """
+    pool: ClientPool
+
+    def __init__(self, model_name: str, api_key: str):
+        super().__init__(model_name)
+        self._api_key = api_key
+        self.client = self.pool.client(api_key)
+        # same connection pool, with the SDK's own retries
+        self.retrying_client = self.client.with_options(max_retries=SDK_MAX_RETRIES)
+
+    @property
+    def aclient(self) -> Any:
+        """
+        Async SDK client for the running event loop.
+        """
+        return self.pool.async_client(self._api_key)
@@ -1,20 +1,55 @@
 import os
-from anthropic import Anthropic
-from .base_client import BaseClient
 
-class AnthropicClient(BaseClient):
+from ._pool import ClientPool, PooledClient
+from .cache import llm_cache
+from .retry import retry_llm
+
+
+def _split_system(messages):
+    """
+    Messages API takes the system prompt as a top-level argument, not as a message role.
+    """
+    system = "\n".join(m['content'] for m in messages if m['role'] == 'system')
+    return system, [m for m in messages if m['role'] != 'system']
+
+
+class AnthropicClient(PooledClient):
+    pool = ClientPool('anthropic', 'Anthropic', 'AsyncAnthropic')
+
+    # max_tokens is mandatory on the Messages API
+    MAX_TOKENS = 1024
+
     def __init__(self, model_name: str):
-        super().__init__(model_name)
         api_key = os.getenv('ANTHROPIC_API_KEY')
         if not api_key:
             raise EnvironmentError('Variable ANTHROPIC_API_KEY not defined')
-        self.client = Anthropic(api_key=api_key)
-
-    def generate(self, messages, **kwargs):
-        prompt = messages
-        response = self.client.messages.create(
-            model=self.model_name,
-            prompt=prompt,
-            **kwargs
-        )
-        return response.completion
+        super().__init__(model_name, api_key)
+
+    def _params(self, messages, system_prompt, kwargs):
+        system, chat = _split_system(messages)
+        params = {'model': self.model_name, 'messages': chat, 'max_tokens': self.MAX_TOKENS, **kwargs}
+        blocks = []
+        if system_prompt:
+            # cache_control marks the static system prompt as a reusable cached prefix
+            blocks.append({'type': 'text', 'text': system_prompt, 'cache_control': {'type': 'ephemeral'}})
+        if system:
+            blocks.append({'type': 'text', 'text': system})
+        if blocks:
+            params['system'] = blocks
+        return params
+
+    @llm_cache.memoize()
+    @retry_llm()
+    def generate(self, messages, system_prompt=None, **kwargs):
+        response = self.client.messages.create(**self._params(messages, system_prompt, kwargs))
+        return response.content[0].text
+
+    @llm_cache.memoize()
+    @retry_llm()
+    async def agenerate(self, messages, system_prompt=None, **kwargs):
+        response = await self.aclient.messages.create(**self._params(messages, system_prompt, kwargs))
+        return response.content[0].text
+
+    def generate_stream(self, messages, system_prompt=None, **kwargs):
+        with self.retrying_client.messages.stream(**self._params(messages, system_prompt, kwargs)) as stream:
+            yield from stream.text_stream
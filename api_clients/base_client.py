@@ -1,20 +1,100 @@
+import asyncio
+import os
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 
 class BaseClient(ABC):
     """
     Abstract interface for LLM clients.
     """
+    # Shared by every client so the cap bounds the whole process (avoids 429s)
+    _sem: Optional[asyncio.Semaphore] = None
+    _sem_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def __init__(self, model_name: str):
         self.model_name = model_name
 
+    @classmethod
+    def semaphore(cls) -> asyncio.Semaphore:
+        """
+        Return the semaphore bounding concurrent LLM requests (OWL_MAX_CONC, default 8).
+        Created lazily, and re-created when called from a new event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if BaseClient._sem is None or BaseClient._sem_loop is not loop:
+            BaseClient._sem = asyncio.Semaphore(int(os.getenv('OWL_MAX_CONC', '8')))
+            BaseClient._sem_loop = loop
+        return BaseClient._sem
+
     @abstractmethod
     def generate(
         self,
         messages: List[Dict[str, str]],  # {'role': 'system'|'user'|'assistant', 'content': str}
+        system_prompt: Optional[str] = None,
         **kwargs: Any
     ) -> str:
         """
         Sends a prompt in the form of messages and returns the textual response.
+        system_prompt is a static instruction that each client places where its API
+        expects it (and caches it as a prompt prefix when the API allows it).
         """
         pass
+
+    @abstractmethod
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        **kwargs: Any
+    ) -> str:
+        """
+        Async twin of generate: awaits the provider instead of blocking,
+        so independent calls can run concurrently.
+        """
+        pass
+
+    def generate_stream(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        **kwargs: Any
+    ) -> Iterator[str]:
+        """
+        Yields the response incrementally as text deltas.
+        Default: a single chunk from generate, for providers without streaming.
+        """
+        yield self.generate(messages, system_prompt=system_prompt, **kwargs)
+
+    async def agenerate_many(
+        self,
+        messages_list: List[Any],
+        offline: bool = False,
+        poll_interval: Optional[float] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        Sends independent prompts concurrently, bounded by the shared semaphore.
+        Responses keep the order of messages_list.
+        offline/poll_interval select a provider batch API where a client implements one
+        (see OpenAIClient.generate_many); here they are ignored.
+        """
+        sem = self.semaphore()
+
+        async def _one(messages: Any) -> str:
+            async with sem:
+                return await self.agenerate(messages, **kwargs)
+
+        return list(await asyncio.gather(*[_one(m) for m in messages_list]))
+
+    def generate_many(
+        self,
+        messages_list: List[Any],
+        offline: bool = False,
+        poll_interval: Optional[float] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        Blocking wrapper around agenerate_many (not callable from a running event loop).
+        Without a batch API, offline requests fall back to concurrent requests.
+        """
+        return asyncio.run(self.agenerate_many(messages_list, **kwargs))
@@ -0,0 +1,203 @@
+import hashlib
+import inspect
+import json
+import math
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+_MISS = object()
+
+
+class LLMCache:
+    """
+    Two-tier response cache for LLM clients.
+
+    Exact tier: SHA-256 over (model, messages, kwargs), bounded by size (LRU) and TTL.
+    Semantic tier: only when an embed_fn is given; on an exact miss, returns the stored
+    response whose prompt embedding has a cosine similarity >= threshold.
+
+    Only deterministic calls (temperature <= 0) are cached.
+
+    Usage:
+        class MyClient(BaseClient):
+            @llm_cache.memoize()
+            def generate(self, messages, **kwargs): ...
+    """
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 3600.0,
+        embed_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        threshold: float = 0.92
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # scope (model + kwargs) -> list of (stored_at, embedding, norm, response)
+        self._semantic: Dict[str, List[Tuple[float, Sequence[float], float, str]]] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _hash(payload: Dict[str, Any]) -> str:
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_cacheable(kwargs: Dict[str, Any]) -> bool:
+        temperature = kwargs.get('temperature')
+        return temperature is not None and temperature <= 0
+
+    @staticmethod
+    def _prompt_text(messages: Any) -> str:
+        if isinstance(messages, str):
+            return messages
+        if isinstance(messages, list):
+            return "\n".join(
+                m['content'] if isinstance(m, dict) else str(m) for m in messages
+            )
+        return str(messages)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._semantic.clear()
+
+    def _embed(self, prompt: str) -> Optional[Tuple[Sequence[float], float]]:
+        """
+        Return (embedding, norm) of prompt, or None without embed_fn or for a null vector.
+        """
+        if self.embed_fn is None:
+            return None
+        vector = self.embed_fn(prompt)
+        norm = math.sqrt(sum(x * x for x in vector))
+        return (vector, norm) if norm else None
+
+    def get(self, key: str, scope: str, prompt: str) -> Tuple[Any, Optional[Tuple[Sequence[float], float]]]:
+        """
+        Return (response, embedding) for key or a semantically close prompt, with _MISS
+        as response on a miss. The prompt embedding, computed only after an exact miss,
+        is handed back so that set() does not compute it again.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, response = entry
+                if now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    return response, None
+                del self._entries[key]
+            if self.embed_fn is None or not self._semantic.get(scope):
+                return _MISS, None
+
+        embedding = self._embed(prompt)
+        if embedding is None:
+            return _MISS, None
+        vector, norm = embedding
+        with self._lock:
+            bucket = self._semantic.get(scope, [])
+            # semantic entries expire like exact ones
+            bucket[:] = [item for item in bucket if now - item[0] <= self.ttl]
+            candidates = list(bucket)
+        for _, other, other_norm, response in candidates:
+            similarity = sum(a * b for a, b in zip(vector, other)) / (norm * other_norm)
+            if similarity >= self.threshold:
+                return response, embedding
+        return _MISS, embedding
+
+    def set(
+        self,
+        key: str,
+        scope: str,
+        prompt: str,
+        response: str,
+        embedding: Optional[Tuple[Sequence[float], float]] = None
+    ) -> None:
+        if embedding is None:
+            embedding = self._embed(prompt)
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            if embedding is not None:
+                vector, norm = embedding
+                bucket = self._semantic.setdefault(scope, [])
+                bucket.append((now, vector, norm, response))
+                if len(bucket) > self.maxsize:
+                    del bucket[0]
+
+    @staticmethod
+    def _bind(
+        signature: inspect.Signature, client: Any, args: tuple, kwargs: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Every argument of the call by parameter name (defaults applied, **kwargs flattened),
+        except the client itself: positional arguments are part of the key like the others.
+        None when the arguments do not match the signature (the call itself will raise).
+        """
+        try:
+            bound = signature.bind(client, *args, **kwargs)
+        except TypeError:
+            return None
+        bound.apply_defaults()
+        arguments: Dict[str, Any] = {}
+        for name, value in list(bound.arguments.items())[1:]:
+            if signature.parameters[name].kind is inspect.Parameter.VAR_KEYWORD:
+                arguments.update(value)
+            else:
+                arguments[name] = value
+        return arguments
+
+    def _lookup_args(self, client: Any, arguments: Dict[str, Any]) -> Tuple[str, str, str]:
+        messages = arguments.get('messages')
+        options = {k: v for k, v in arguments.items() if k != 'messages'}
+        scope = self._hash({'model': client.model_name, 'kwargs': options})
+        key = self._hash({'model': client.model_name, 'messages': messages, 'kwargs': options})
+        return key, scope, self._prompt_text(messages)
+
+    def memoize(self) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Decorator for a client's generate/agenerate method (sync or async).
+        """
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            signature = inspect.signature(fn)
+            if inspect.iscoroutinefunction(fn):
+                @wraps(fn)
+                async def async_wrapper(client: Any, *args: Any, **kwargs: Any) -> Any:
+                    arguments = self._bind(signature, client, args, kwargs)
+                    if arguments is None or not self.is_cacheable(arguments):
+                        return await fn(client, *args, **kwargs)
+                    key, scope, prompt = self._lookup_args(client, arguments)
+                    cached, embedding = self.get(key, scope, prompt)
+                    if cached is not _MISS:
+                        return cached
+                    response = await fn(client, *args, **kwargs)
+                    self.set(key, scope, prompt, response, embedding)
+                    return response
+                return async_wrapper
+
+            @wraps(fn)
+            def wrapper(client: Any, *args: Any, **kwargs: Any) -> Any:
+                arguments = self._bind(signature, client, args, kwargs)
+                if arguments is None or not self.is_cacheable(arguments):
+                    return fn(client, *args, **kwargs)
+                key, scope, prompt = self._lookup_args(client, arguments)
+                cached, embedding = self.get(key, scope, prompt)
+                if cached is not _MISS:
+                    return cached
+                response = fn(client, *args, **kwargs)
+                self.set(key, scope, prompt, response, embedding)
+                return response
+            return wrapper
+        return decorator
+
+
+# Shared by every provider client; set llm_cache.embed_fn to enable the semantic tier
+llm_cache = LLMCache()
@@ -1,7 +1,38 @@
 import os
-# Hypothétique librairie Google PaLM
-from google import genai
+from threading import Lock
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:
+    from google import genai
+
 from .base_client import BaseClient
+from .cache import llm_cache
+from .retry import retry_llm
+
+# Roles whose content is concatenated into the Gemini prompt
+_PROMPT_ROLES = frozenset(('system', 'user'))
+
+# One genai client (sync surface + `.aio`) per API key, shared by every GoogleClient
+_shared_clients: Dict[str, "genai.Client"] = {}
+_shared_lock = Lock()
+
+
+def _shared_client(api_key: str) -> "genai.Client":
+    # genai is only loaded once a GoogleClient is built
+    from google import genai
+
+    with _shared_lock:
+        if api_key not in _shared_clients:
+            _shared_clients[api_key] = genai.Client(api_key=api_key)
+        return _shared_clients[api_key]
+
+
+def _config(system_prompt, kwargs):
+    # generate_content only takes model/contents/config: options (temperature...) go in config
+    if system_prompt:
+        return {**kwargs, 'system_instruction': system_prompt}
+    return kwargs or None
+
 
 class GoogleClient(BaseClient):
     def __init__(self, model_name: str):
@@ -9,13 +40,37 @@ class GoogleClient(BaseClient):
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
             raise EnvironmentError('Variable GEMINI_API_KEY not defined')
-        client = genai.Client(api_key="GEMINI_API_KEY")
+        self.client = _shared_client(api_key)
 
-    def generate(self, messages, **kwargs):
-        prompt = "".join([m['content'] for m in messages if m['role'] in ('system','user')])
+    @llm_cache.memoize()
+    @retry_llm()
+    def generate(self, messages, system_prompt=None, **kwargs):
+        prompt = "".join(m['content'] for m in messages if m['role'] in _PROMPT_ROLES)
         response = self.client.models.generate_content(
             model=self.model_name,
-            prompt=prompt,
-            **kwargs
+            contents=prompt,
+            config=_config(system_prompt, kwargs)
+        )
+        return response.text
+
+    @llm_cache.memoize()
+    @retry_llm()
+    async def agenerate(self, messages, system_prompt=None, **kwargs):
+        prompt = "".join(m['content'] for m in messages if m['role'] in _PROMPT_ROLES)
+        # genai exposes its async surface under `client.aio`
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=_config(system_prompt, kwargs)
         )
         return response.text
+
+    def generate_stream(self, messages, system_prompt=None, **kwargs):
+        prompt = "".join(m['content'] for m in messages if m['role'] in _PROMPT_ROLES)
+        for chunk in self.client.models.generate_content_stream(
+            model=self.model_name,
+            contents=prompt,
+            config=_config(system_prompt, kwargs)
+        ):
+            if chunk.text:
+                yield chunk.text
@@ -1,25 +1,127 @@
+import json
 import os
-from openai import OpenAI
+import time
 
-from .base_client import BaseClient
+from ._pool import ClientPool, PooledClient
+from .cache import llm_cache
+from .retry import retry_llm
+
+
+def _with_system(messages, system_prompt):
+    # OpenAI caches the longest repeated prompt prefix: the static system message goes first
+    if not system_prompt:
+        return messages
+    return [{"role": "system", "content": system_prompt}, *messages]
+
+
+class OpenAIClient(PooledClient):
+    pool = ClientPool('openai', 'OpenAI', 'AsyncOpenAI')
+
+    # Below this size the Batch API turnaround is not worth the discount
+    BATCH_THRESHOLD = 1000
+    BATCH_ENDPOINT = "/v1/chat/completions"
 
-class OpenAIClient(BaseClient):
     def __init__(self, model_name: str):
-        super().__init__(model_name)
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise EnvironmentError('Variable OPENAI_API_KEY not defined')
-        self.client = OpenAI()
+        super().__init__(model_name, api_key)
 
-    def generate(self, message, **kwargs):
+    @llm_cache.memoize()
+    @retry_llm()
+    def generate(self, messages, system_prompt=None, **kwargs):
         response = self.client.chat.completions.create(
             model=self.model_name,
-            messages=[
-                {
-                    "role": "user",
-                    "content": message
-                }
-                ],           
+            messages=_with_system(messages, system_prompt),
+            **kwargs
+        )
+        return response.choices[0].message.content
+
+    @llm_cache.memoize()
+    @retry_llm()
+    async def agenerate(self, messages, system_prompt=None, **kwargs):
+        response = await self.aclient.chat.completions.create(
+            model=self.model_name,
+            messages=_with_system(messages, system_prompt),
             **kwargs
         )
         return response.choices[0].message.content
+
+    def generate_stream(self, messages, system_prompt=None, **kwargs):
+        stream = self.retrying_client.chat.completions.create(
+            model=self.model_name,
+            messages=_with_system(messages, system_prompt),
+            stream=True,
+            **kwargs
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def generate_many(self, messages_list, offline=False, poll_interval=30.0, **kwargs):
+        """
+        Sends many prompts at once. With offline=True and more than BATCH_THRESHOLD prompts,
+        goes through the OpenAI Batch API (cheaper, but completes within 24h);
+        otherwise issues concurrent requests.
+        """
+        if offline and len(messages_list) > self.BATCH_THRESHOLD:
+            return self._generate_batch(messages_list, poll_interval, **kwargs)
+        return super().generate_many(messages_list, **kwargs)
+
+    def _generate_batch(self, messages_list, poll_interval, system_prompt=None, **kwargs):
+        lines = [
+            json.dumps({
+                "custom_id": str(idx),
+                "method": "POST",
+                "url": self.BATCH_ENDPOINT,
+                "body": {
+                    "model": self.model_name,
+                    "messages": _with_system(messages, system_prompt),
+                    **kwargs
+                }
+            })
+            for idx, messages in enumerate(messages_list)
+        ]
+        batch_file = self.retrying_client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.retrying_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=self.BATCH_ENDPOINT,
+            completion_window="24h"
+        )
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.retrying_client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+        results = [None] * len(messages_list)
+        answered = set()
+        errors = {}
+        # successful requests land in output_file_id, failed ones in error_file_id
+        # (either may be None when every request went the other way)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id is None:
+                continue
+            for line in self.retrying_client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                custom_id = item["custom_id"]
+                response = item.get("response") or {}
+                if item.get("error") or response.get("status_code") != 200:
+                    errors[custom_id] = item.get("error") or response.get("body")
+                    continue
+                results[int(custom_id)] = response["body"]["choices"][0]["message"]["content"]
+                answered.add(custom_id)
+        if errors:
+            custom_id, error = next(iter(errors.items()))
+            raise RuntimeError(
+                f"Batch {batch.id}: {len(errors)} requests failed (request {custom_id}: {error})"
+            )
+        missing = [str(idx) for idx in range(len(messages_list)) if str(idx) not in answered]
+        if missing:
+            raise RuntimeError(f"Batch {batch.id}: no result for requests {missing}")
+        return results
@@ -0,0 +1,125 @@
+import asyncio
+import inspect
+import random
+import re
+import time
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from ..logger import OrchestratorLogger
+
+# 408/409 are transient on the OpenAI/Anthropic APIs, 429 is a rate limit
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+# SDK errors raised without an HTTP status (network failures, timeouts)
+RETRYABLE_ERRORS = frozenset({'APIConnectionError', 'APITimeoutError'})
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    # openai/anthropic expose status_code, google-genai exposes code
+    code = getattr(exc, 'status_code', None)
+    if code is None:
+        code = getattr(exc, 'code', None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Return True for transient provider errors (rate limits, 5xx, connection issues).
+    """
+    if type(exc).__name__ in RETRYABLE_ERRORS:
+        return True
+    return _status_code(exc) in RETRYABLE_STATUS
+
+
+# A provider asking for a longer wait than this gets the regular backoff instead
+MAX_RETRY_AFTER = 60.0
+# OpenAI reset durations look like '20ms', '1s' or '6m0s'
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """
+    Return the delay requested by the provider, if any: Retry-After headers first,
+    then the reset time of an exhausted x-ratelimit-remaining-* budget.
+    """
+    headers = getattr(getattr(exc, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms') is not None:
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after') is not None:
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        # HTTP-date form is not worth parsing here: fall back to backoff
+        return None
+    for budget in ('requests', 'tokens'):
+        if headers.get(f'x-ratelimit-remaining-{budget}') == '0':
+            reset = headers.get(f'x-ratelimit-reset-{budget}')
+            if reset is not None:
+                return _parse_duration(reset)
+    return None
+
+
+def _delay(exc: BaseException, attempt: int, base_delay: float, max_delay: float) -> float:
+    requested = _retry_after(exc)
+    # an hour-long Retry-After would hold a worker thread or the event loop task:
+    # above MAX_RETRY_AFTER, back off as usual and let the next attempt find out
+    if requested is not None and requested <= MAX_RETRY_AFTER:
+        return requested
+    # exponential backoff with full jitter
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def retry_llm(
+    max_attempts: int = 5,
+    base_delay: float = 0.1,
+    max_delay: float = 8.0
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator retrying a client's generate/agenerate on transient errors.
+
+    Waits for Retry-After when the provider sends it, otherwise
+    base_delay * 2**attempt (capped at max_delay) with jitter.
+    Non-retryable errors and the last failure are re-raised unchanged.
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                for attempt in range(max_attempts):
+                    try:
+                        return await fn(*args, **kwargs)
+                    except Exception as exc:
+                        if attempt == max_attempts - 1 or not is_retryable(exc):
+                            raise
+                        delay = _delay(exc, attempt, base_delay, max_delay)
+                        OrchestratorLogger.get_logger().warning(
+                            '%s failed (%s), retrying in %.2fs', fn.__qualname__, exc, delay
+                        )
+                        await asyncio.sleep(delay)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            for attempt in range(max_attempts):
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as exc:
+                    if attempt == max_attempts - 1 or not is_retryable(exc):
+                        raise
+                    delay = _delay(exc, attempt, base_delay, max_delay)
+                    OrchestratorLogger.get_logger().warning(
+                        '%s failed (%s), retrying in %.2fs', fn.__qualname__, exc, delay
+                    )
+                    time.sleep(delay)
+        return wrapper
+    return decorator
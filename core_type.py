@@ -1,11 +1,29 @@
-from typing import Dict, Type, Any, Set
+from typing import AbstractSet, Callable, Dict, FrozenSet, Optional, Tuple, Type, Any
 from .errors import NodeValidationError
 
+# Distinguishes a missing key from a key explicitly set to None
+_MISSING = object()
+
+
+def _typecheck(value: Any, typ: Type) -> bool:
+    """
+    isinstance with an exact-type fast path (a pointer compare for built-ins).
+    """
+    return type(value) is typ or isinstance(value, typ)
+
+
+def _type_error(prefix: str, key: str, typ: Type, value: Any) -> None:
+    raise NodeValidationError(
+        f"{prefix} '{key}' expected type {typ.__name__}, got {type(value).__name__}."
+    )
+
 class NodeInputType:
     """
     Define the input types (required and optionals) for a node
     Représente les types d'inputs d'un Node, séparés en requis et optionnels.
     """
+    __slots__ = ('required', 'optional', '_required_keys', '_optional_keys', '_all_keys', '_all', '_validator')
+
     def __init__(
         self,
         required: Dict[str, Type] = None,
@@ -18,17 +36,32 @@ class NodeInputType:
         duplicates = set(self.required) & set(self.optional)
         if duplicates:
             raise ValueError(f"Duplicated key between required and optional: {duplicates}")
+        self._refresh()
+
+    def _refresh(self) -> None:
+        """
+        Recompute the cached key sets and drop the validator after a definition change.
+        """
+        self._required_keys: FrozenSet[str] = frozenset(self.required)
+        self._optional_keys: FrozenSet[str] = frozenset(self.optional)
+        self._all_keys: FrozenSet[str] = self._required_keys | self._optional_keys
+        # merged schema: key -> (type, required)
+        self._all: Dict[str, Tuple[Type, bool]] = {k: (t, True) for k, t in self.required.items()}
+        self._all.update((k, (t, False)) for k, t in self.optional.items())
+        self._validator: Optional[Callable[[Dict[str, Any]], None]] = None
 
-    def keys(self, include_required: bool = True, include_optional: bool = True) -> Set[str]:
+    def keys(self, include_required: bool = True, include_optional: bool = True) -> AbstractSet[str]:
         """
         Return all the key according the asked categories : optional or required
+        (a cached, read-only set)
         """
-        keys: Set[str] = set()
+        if include_required and include_optional:
+            return self._all_keys
         if include_required:
-            keys |= set(self.required.keys())
+            return self._required_keys
         if include_optional:
-            keys |= set(self.optional.keys())
-        return keys
+            return self._optional_keys
+        return frozenset()
 
     def add_input(self, name: str, type_: Type, required: bool = True) -> None:
         """
@@ -36,12 +69,13 @@ class NodeInputType:
         Raise a KeyError if the input already exists.
         Raise a TypeError if the type is not correct.
         """
-        if name in self.keys():
+        if name in self._all_keys:
             raise KeyError(f"Input '{name}' already exists.")
         if not isinstance(name, str) or not isinstance(type_, type):
             raise TypeError("Name or type is not valid.")
         target = self.required if required else self.optional
         target[name] = type_
+        self._refresh()
 
     def remove_input(self, name: str) -> None:
         """
@@ -53,22 +87,50 @@ class NodeInputType:
             del self.optional[name]
         else:
             raise KeyError(f"Input '{name}' doesn't exist.")
+        self._refresh()
+
+    def _compile_validator(self) -> Callable[[Dict[str, Any]], None]:
+        """
+        Generate (exec) a validation function specialised for the current definition:
+        one straight-line check per key, no loop over the schema.
+        Must be rebuilt whenever required/optional change.
+        """
+        # keys may not be identifiers: they and their types are bound as k<i>/t<i>
+        namespace: Dict[str, Any] = {
+            '_MISSING': _MISSING,
+            'NodeValidationError': NodeValidationError,
+            '_type_error': _type_error,
+        }
+        lines = ['def _validate(data):']
+        for i, (key, (typ, required)) in enumerate(self._all.items()):
+            namespace[f'k{i}'] = key
+            namespace[f't{i}'] = typ
+            if required:
+                namespace[f'm{i}'] = f"Missing Required input: '{key}'"
+                lines += [
+                    '    try:',
+                    f'        v{i} = data[k{i}]',
+                    '    except KeyError:',
+                    f'        raise NodeValidationError(m{i}) from None',
+                    f'    if type(v{i}) is not t{i} and not isinstance(v{i}, t{i}):',
+                    f'        _type_error("Input", k{i}, t{i}, v{i})',
+                ]
+            else:
+                lines += [
+                    f'    v{i} = data.get(k{i}, _MISSING)',
+                    f'    if v{i} is not _MISSING and type(v{i}) is not t{i} and not isinstance(v{i}, t{i}):',
+                    f'        _type_error("Optional Input", k{i}, t{i}, v{i})',
+                ]
+        lines.append('    return None')
+        exec('\n'.join(lines), namespace)
+        return namespace['_validate']
 
     def validate(self, data: Dict[str, Any]) -> None:
         """
         Validate an input dictionary against its type definition.
         """
-        # Vérifier les requis
-        for key, typ in self.required.items():
-            if key not in data:
-                raise NodeValidationError(f"Missing Required input: '{key}'")
-            if not isinstance(data[key], typ):
-                raise NodeValidationError(
-                    f"Input '{key}' expected type {typ.__name__}, got {type(data[key]).__name__}."
-                )
-        # Vérifier les optionnels fournis
-        for key, value in data.items():
-            if key in self.optional and not isinstance(value, self.optional[key]):
-                raise NodeValidationError(
-                    f"Optional Input '{key}' expected type {self.optional[key].__name__}, got {type(value).__name__}."
-                )
+        validator = self._validator
+        if validator is None:
+            # compilé au premier appel : la plupart des schémas sont figés d'ici là
+            validator = self._validator = self._compile_validator()
+        validator(data)
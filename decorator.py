@@ -1,13 +1,16 @@
 from functools import wraps
-from typing import Callable, Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Mapping, Optional, Set, Tuple
 
-from .node import BaseNode, LlmNode
+from .node import BaseNode, LlmNode, NodeCall
 from .core_type import NodeInputType
 from .workflow import Workflow
 from .errors import NodeConnectionError
 
 # Registry to store declared nodes
 _nodes_registry: Dict[str, BaseNode] = {}
+# Read-only live view handed out by get_registered_nodes (no copy per call)
+_nodes_registry_view: Mapping[str, BaseNode] = MappingProxyType(_nodes_registry)
 
 def node(
     name: str,
@@ -68,28 +71,35 @@ def workflow(name: str) -> Callable[[Callable[..., Any]], Callable[..., Workflow
     """
     Decorator to declare a Workflow.
 
-    The decorated function should accept an argument `wf: Workflow` and add/connect nodes to it.
+    The decorated function should accept an argument `wf: Workflow` and call nodes on it
+    (it runs with `wf` as the active workflow).
     Adds automatic validations:
-      - Topological sort (cycles)
+      - Topological sort (cycles), kept cached on the workflow for its runs
       - Detection of orphan nodes
     """
     def decorator(build_fn: Callable[..., Any]) -> Callable[..., Workflow]:
         @wraps(build_fn)
         def wrapper(*args: Any, **kwargs: Any) -> Workflow:
             wf = Workflow(name)
-            # Call the workflow construction function
-            build_fn(wf, *args, **kwargs)
+            # Call the workflow construction function (node calls register in the active workflow)
+            with wf:
+                build_fn(wf, *args, **kwargs)
             # Cycle validation
             try:
-                ordered: List[BaseNode] = wf._topological_sort()
+                ordered: Tuple[NodeCall, ...] = wf._topological_sort()
             except NodeConnectionError as exc:
                 raise NodeConnectionError(
                     f"Validation of workflow '{name}' failed (cycle detected): {exc}"
                 )
-            # Detection of orphan nodes
-            orphan_nodes = [node.name for node in wf.nodes
-                            if not wf.connections.get(node)
-                            and all(node not in dests for dests in wf.connections.values())]
+            # Detection of orphan nodes: a single pass over the edges
+            connected: Set[NodeCall] = set()
+            for call in wf.calls:
+                upstream = call.get_inputs()
+                if upstream:
+                    connected.add(call)
+                    connected.update(upstream)
+            orphan_nodes = [call.alias or call.prototype.name
+                            for call in wf.calls if call not in connected]
             if orphan_nodes:
                 raise NodeConnectionError(
                     f"Orphan nodes detected in workflow '{name}': {orphan_nodes}"
@@ -98,6 +108,10 @@ def workflow(name: str) -> Callable[[Callable[..., Any]], Callable[..., Workflow
         return wrapper
     return decorator
 
-def get_registered_nodes() -> Dict[str, BaseNode]:
-    """Returns the registry of declared nodes."""
-    return dict(_nodes_registry)
+def get_registered_nodes() -> Mapping[str, BaseNode]:
+    """Returns a read-only view of the registry of declared nodes."""
+    return _nodes_registry_view
+
+def get_registered_node(name: str) -> BaseNode:
+    """Returns the declared node registered under name (KeyError if unknown)."""
+    return _nodes_registry[name]
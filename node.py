@@ -1,20 +1,47 @@
 from __future__ import annotations
-from typing import Callable, Dict, Any, Set, List, Optional
+import asyncio
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import AbstractSet, Awaitable, Callable, Dict, Any, Hashable, List, Optional, Tuple
 from .core_type import NodeInputType
 from .errors import NodeConnectionError, NodeValidationError, NodeExecutionError
 from .api_clients import get_client
+from .api_clients.base_client import BaseClient
 from .logger import OrchestratorLogger
 
+def _canonical(value: Any) -> Hashable:
+    """
+    Hashable form of value, tagged with types at every level so that equal but
+    distinct values (1, 1.0, True; a list and a tuple) never share a key.
+    Raises TypeError for values that cannot be keyed.
+    """
+    if isinstance(value, dict):
+        return (type(value), frozenset((_canonical(k), _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_canonical(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(_canonical(v) for v in value))
+    hash(value)
+    return (type(value), value)
+
+
 class NodeCall:
     """
     Represents a call to a BaseNode within a workflow,
     holding its prototype, inputs (other NodeCall instances),
     and an optional alias for namespacing.
     """
+    __slots__ = ('prototype', 'inputs', 'alias', '_alias_rename')
+
     def __init__(self, prototype: BaseNode, inputs: List[NodeCall], alias: Optional[str] = None):
         self.prototype = prototype
         self.inputs = inputs
         self.alias = alias
+        # output key -> namespaced key, computed once instead of on every run
+        self._alias_rename: Optional[Dict[str, str]] = (
+            {k: f"{alias}_{k}" for k in prototype.get_output_keys()} if alias else None
+        )
 
     @property
     def input_types(self) -> NodeInputType:
@@ -57,12 +84,22 @@ class BaseNode:
 
     Can be initialized with a Python function (run_fn) or through an LLM provider.
     '''
+    __slots__ = (
+        'name', 'input_types', 'output_types', 'logger', '_run_fn', '_arun_fn', '_output_validated',
+        'cacheable', '_cache', '_cache_lock'
+    )
+
+    # number of outputs kept per cacheable node
+    CACHE_SIZE = 128
+
     def __init__(
         self,
         name: str,
         input_types: NodeInputType,
         output_types: NodeInputType,
-        run_fn: Callable[..., Dict[str, Any]]
+        run_fn: Callable[..., Dict[str, Any]],
+        arun_fn: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None,
+        cacheable: bool = False
     ):
         self.name = name
         self.input_types = input_types
@@ -71,45 +108,143 @@ class BaseNode:
         if run_fn is None:
             raise ValueError('run_fn must be provided for BaseNode')
         self._run_fn = run_fn
+        self._arun_fn = arun_fn
+        # set by subclasses whose run_fn builds outputs that match output_types by construction
+        self._output_validated = False
+        # opt-in: only for nodes whose outputs depend on their inputs alone
+        self.cacheable = cacheable
+        self._cache: Optional[OrderedDict] = OrderedDict() if cacheable else None
+        self._cache_lock = Lock()
 
-    def get_input_keys(self) -> Set[str]:
+    def get_input_keys(self) -> AbstractSet[str]:
         return self.input_types.keys()
 
-    def get_output_keys(self) -> Set[str]:
+    def get_output_keys(self) -> AbstractSet[str]:
         return self.output_types.keys()
 
     def validate_connection(self, upstream_node: 'BaseNode') -> None:
-        missing_keys = set(self.input_types.required.keys()) - set(upstream_node.get_output_keys())
+        missing_keys = self.input_types._required_keys - upstream_node.output_types._all_keys
         if missing_keys:
-            self.logger.error(f'Connection error {upstream_node.name} -> {self.name}: missing {missing_keys}')
+            self.logger.error('Connection error %s -> %s: missing %s', upstream_node.name, self.name, missing_keys)
             raise NodeConnectionError(
                 f'Cannot connect {upstream_node.name} -> {self.name}: missing keys {missing_keys}'
             )
 
-    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        self.logger.debug(f'Node {self.name} starting with inputs: {inputs}')
+    def _validate_inputs(self, inputs: Dict[str, Any]) -> None:
         try:
             self.input_types.validate(inputs)
         except Exception as exc:
-            self.logger.error(f'Input validation failed for {self.name}: {exc}')
+            self.logger.error('Input validation failed for %s: %s', self.name, exc)
             raise NodeValidationError(f'Input validation for {self.name} failed: {exc}')
 
+    def _validate_outputs(self, results: Dict[str, Any]) -> None:
+        try:
+            self.output_types.validate(results)
+        except Exception as exc:
+            self.logger.error('Output validation failed for %s: %s', self.name, exc)
+            raise NodeValidationError(f'Output validation for {self.name} failed: {exc}')
+
+    @staticmethod
+    def _cache_key(inputs: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Canonical key for inputs, or None when they cannot be keyed.
+        """
+        try:
+            return _canonical(inputs)
+        except TypeError:
+            return None
+
+    def _cache_get(self, key: Optional[Hashable]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        with self._cache_lock:
+            results = self._cache.get(key)
+            if results is None:
+                return None
+            self._cache.move_to_end(key)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Node %s served from cache', self.name)
+        # copy so that callers cannot alter the cached entry
+        return dict(results)
+
+    def _cache_set(self, key: Optional[Hashable], results: Dict[str, Any]) -> None:
+        if key is None:
+            return
+        with self._cache_lock:
+            self._cache[key] = dict(results)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        if self._cache is not None:
+            with self._cache_lock:
+                self._cache.clear()
+
+    def _start(self, inputs: Dict[str, Any]) -> Tuple[Optional[Hashable], Optional[Dict[str, Any]]]:
+        """
+        Steps before execution: validate inputs, then look the cache up.
+        Returns the cache key (None when not caching) and the cached outputs, if any.
+        """
+        # inputs may hold long chat histories: skip their repr unless DEBUG is on
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Node %s starting with inputs: %s', self.name, inputs)
+        # invalid inputs raise here, before any cache lookup
+        self._validate_inputs(inputs)
+        key = self._cache_key(inputs) if self.cacheable else None
+        return key, self._cache_get(key)
+
+    def _execution_error(self, exc: Exception) -> NodeExecutionError:
+        self.logger.error('Execution error in %s: %s', self.name, exc)
+        return NodeExecutionError(f"Error during execution of node {self.name}: {exc}")
+
+    def _finish(self, key: Optional[Hashable], results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Steps after execution: validate outputs, then store them in the cache.
+        """
+        if not self._output_validated:
+            self._validate_outputs(results)
+        self._cache_set(key, results)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Node %s completed with outputs: %s', self.name, results)
+        return results
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        key, cached = self._start(inputs)
+        if cached is not None:
+            return cached
         try:
             results = self._run_fn(**inputs)
-        except NodeExecutionError:
+        except (NodeExecutionError, NodeValidationError):
             raise
         except Exception as exc:
-            self.logger.error(f'Execution error in {self.name}: {exc}')
-            raise NodeExecutionError(f"Error during execution of node {self.name}: {exc}") from exc
+            raise self._execution_error(exc) from exc
+        return self._finish(key, results)
+
+    async def arun(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of run. Awaits arun_fn when the node has one,
+        otherwise runs the synchronous node in a worker thread.
+        """
+        if self._arun_fn is None:
+            return await asyncio.to_thread(self.run, inputs)
 
+        key, cached = self._start(inputs)
+        if cached is not None:
+            return cached
         try:
-            self.output_types.validate(results)
+            results = await self._arun_fn(**inputs)
+        except (NodeExecutionError, NodeValidationError):
+            raise
         except Exception as exc:
-            self.logger.error(f'Output validation failed for {self.name}: {exc}')
-            raise NodeValidationError(f'Output validation for {self.name} failed: {exc}')
+            raise self._execution_error(exc) from exc
+        return self._finish(key, results)
 
-        self.logger.debug(f'Node {self.name} completed with outputs: {results}')
-        return results
+    def run_many(self, inputs_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run the node over a list of inputs, returning outputs in the same order.
+        """
+        return [self.run(inputs) for inputs in inputs_list]
 
     def clone(self, name: str) -> "BaseNode":
         """
@@ -121,6 +256,8 @@ class BaseNode:
             input_types=self.input_types,
             output_types=self.output_types,
             run_fn=self._run_fn,
+            arun_fn=self._arun_fn,
+            cacheable=self.cacheable,
         )
 
     def __call__(self, *upstream_calls: NodeCall, alias: Optional[str] = None) -> NodeCall:
@@ -140,25 +277,46 @@ class BaseNode:
 class LlmNode(BaseNode):
     """
     Node implementation using LLM provider.
+
+    With stream=True (str output only), the response is consumed through
+    client.generate_stream and accumulated, so deltas are logged as they arrive.
+
+    system_prompt, when given, is passed verbatim to the client, which places it where
+    its API expects it (system message, system argument or system_instruction) so that
+    providers can reuse their prompt-prefix cache across calls. Keep it static: dynamic
+    context (retrieved documents, user data) belongs in the messages.
     """
+    __slots__ = ('provider', 'model_name', 'stream', 'system_prompt', '_client', '_output_key')
+
     def __init__(
         self,
         name: str,
         input_types: NodeInputType,
         output_types: NodeInputType,
         provider: str,
-        model_name: str
+        model_name: str,
+        stream: bool = False,
+        system_prompt: Optional[str] = None,
+        cacheable: bool = False
     ):
         self.provider = provider
         self.model_name = model_name
+        self.stream = stream
+        self.system_prompt = system_prompt
         self.logger = OrchestratorLogger.get_logger()
         client = get_client(provider, model_name)
+        self._client = client
         output_keys = list(output_types.required.keys() or output_types.optional.keys())
         if len(output_keys) != 1:
             raise ValueError(
                 f'For an LLM node with provider, exactly 1 output must be defined. Found: {output_keys}'
             )
         self._output_key = output_keys[0]
+        output_type = output_types.required.get(self._output_key) or output_types.optional.get(self._output_key)
+        if stream and output_type is not str:
+            raise ValueError(
+                f'Streaming LLM node {name} must have a str output. Found: {output_type}'
+            )
 
         def llm_run_fn(**inputs: Any) -> Dict[str, Any]:
             messages = inputs.get('messages')
@@ -166,17 +324,109 @@ class LlmNode(BaseNode):
                 raise NodeValidationError(
                     f'Node {name} expects "messages" to call the LLM'
                 )
+            options = self._client_options(inputs)
             try:
-                content = client.generate(
-                    messages=messages,
-                    **{k: v for k, v in inputs.items() if k != 'messages'}
+                if self.stream:
+                    chunks: List[str] = []
+                    for delta in client.generate_stream(messages=messages, **options):
+                        chunks.append(delta)
+                        self.logger.debug('LLM %s streamed: %r', name, delta)
+                    content = "".join(chunks)
+                else:
+                    content = client.generate(messages=messages, **options)
+            except Exception as exc:
+                self.logger.error('LLM error for %s: %s', name, exc)
+                raise NodeExecutionError(f'LLM error for {name}: {exc}')
+            return self._output(content)
+
+        async def allm_run_fn(**inputs: Any) -> Dict[str, Any]:
+            messages = inputs.get('messages')
+            if messages is None:
+                raise NodeValidationError(
+                    f'Node {name} expects "messages" to call the LLM'
                 )
+            try:
+                async with BaseClient.semaphore():
+                    content = await client.agenerate(messages=messages, **self._client_options(inputs))
             except Exception as exc:
-                self.logger.error(f'LLM error for {name}: {exc}')
+                self.logger.error('LLM error for %s: %s', name, exc)
                 raise NodeExecutionError(f'LLM error for {name}: {exc}')
-            return {self._output_key: content}
+            return self._output(content)
+
+        super().__init__(
+            name, input_types, output_types,
+            run_fn=llm_run_fn, arun_fn=allm_run_fn, cacheable=cacheable
+        )
+        # for a str output, _output's type check replaces the full output validation
+        self._output_validated = output_type is str
+
+    def _output(self, content: Any) -> Dict[str, Any]:
+        """
+        Wrap an LLM response as the node output.
+        Providers return None on refusals, tool calls or failed batch requests:
+        a single type check catches it when the output is a str.
+        """
+        if self._output_validated and type(content) is not str:
+            self.logger.error('Output validation failed for %s: got %s', self.name, type(content).__name__)
+            raise NodeValidationError(
+                f"Output validation for {self.name} failed: "
+                f"Input '{self._output_key}' expected type str, got {type(content).__name__}."
+            )
+        return {self._output_key: content}
+
+    def _client_options(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Client arguments besides messages: the other inputs, plus the static system prompt.
+        """
+        options = {k: v for k, v in inputs.items() if k != 'messages'}
+        if self.system_prompt:
+            options['system_prompt'] = self.system_prompt
+        return options
+
+    def run_many(self, inputs_list: List[Dict[str, Any]], **options: Any) -> List[Dict[str, Any]]:
+        """
+        Run the LLM over many inputs with client.generate_many (concurrent requests,
+        or the OpenAI batch API with offline=True; other providers ignore offline).
+        Inputs carrying different extra arguments go in one generate_many call per
+        distinct set of extras; options are forwarded to every call.
+        """
+        if not inputs_list:
+            return []
+        for inputs in inputs_list:
+            self._validate_inputs(inputs)
+            if inputs.get('messages') is None:
+                raise NodeValidationError(
+                    f'Node {self.name} expects "messages" to call the LLM'
+                )
 
-        super().__init__(name, input_types, output_types, run_fn=llm_run_fn)
+        # (client options, indices into inputs_list), in order of first appearance
+        groups: List[Tuple[Dict[str, Any], List[int]]] = []
+        for idx, inputs in enumerate(inputs_list):
+            client_options = self._client_options(inputs)
+            for group_options, indices in groups:
+                if group_options == client_options:
+                    indices.append(idx)
+                    break
+            else:
+                groups.append((client_options, [idx]))
+
+        contents: List[Any] = [None] * len(inputs_list)
+        try:
+            for client_options, indices in groups:
+                group_contents = self._client.generate_many(
+                    [inputs_list[idx]['messages'] for idx in indices], **client_options, **options
+                )
+                for idx, content in zip(indices, group_contents):
+                    contents[idx] = content
+        except Exception as exc:
+            self.logger.error('LLM error for %s: %s', self.name, exc)
+            raise NodeExecutionError(f'LLM error for {self.name}: {exc}')
+
+        results = [self._output(content) for content in contents]
+        if not self._output_validated:
+            for result in results:
+                self._validate_outputs(result)
+        return results
 
     def clone(self, name: str) -> "LlmNode":
         """
@@ -188,9 +438,14 @@ class LlmNode(BaseNode):
             output_types=self.output_types,
             provider=self.provider,
             model_name=self.model_name,
+            stream=self.stream,
+            system_prompt=self.system_prompt,
+            cacheable=self.cacheable,
         )
     
 class InputNode(BaseNode):
+    __slots__ = ()
+
     def __init__(self, name: str,input_types : NodeInputType, output_types: NodeInputType):
         # pas de run_fn ; c’est juste un placeholder dans le graphe
         super().__init__(name=name,
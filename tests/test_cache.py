@@ -0,0 +1,83 @@
+import asyncio
+import time
+from owl.api_clients.cache import LLMCache
+
+
+class CountingClient:
+    def __init__(self, cache):
+        self.model_name = 'model'
+        self.calls = 0
+
+        @cache.memoize()
+        def generate(client, messages, **kwargs):
+            client.calls += 1
+            return f"answer {client.calls}"
+
+        @cache.memoize()
+        async def agenerate(client, messages, **kwargs):
+            client.calls += 1
+            return f"answer {client.calls}"
+
+        self._generate = generate
+        self._agenerate = agenerate
+
+    def generate(self, messages, **kwargs):
+        return self._generate(self, messages, **kwargs)
+
+    def agenerate(self, messages, **kwargs):
+        return self._agenerate(self, messages, **kwargs)
+
+
+def test_exact_cache_only_for_deterministic_calls():
+    client = CountingClient(LLMCache())
+    messages = [{'role': 'user', 'content': 'hi'}]
+    assert client.generate(messages, temperature=0) == 'answer 1'
+    assert client.generate(messages, temperature=0) == 'answer 1'
+    assert client.generate(messages, temperature=0.7) == 'answer 2'
+    assert client.generate(messages) == 'answer 3'
+    # sync and async calls share entries
+    assert asyncio.run(client.agenerate(messages, temperature=0)) == 'answer 1'
+    assert asyncio.run(client.agenerate([{'role': 'user', 'content': 'yo'}], temperature=0)) == 'answer 4'
+
+
+def test_semantic_cache_hit_above_threshold():
+    embeddings = {'hello world': [1.0, 0.0], 'hello, world': [0.99, 0.05], 'bye': [0.0, 1.0]}
+    client = CountingClient(LLMCache(embed_fn=lambda text: embeddings[text]))
+    assert client.generate('hello world', temperature=0) == 'answer 1'
+    assert client.generate('hello, world', temperature=0) == 'answer 1'
+    assert client.generate('bye', temperature=0) == 'answer 2'
+
+
+def test_semantic_cache_honours_ttl_and_embeds_once():
+    embedded = []
+    def embed(text):
+        embedded.append(text)
+        return [1.0, 0.0]
+    client = CountingClient(LLMCache(ttl=0.05, embed_fn=embed))
+    assert client.generate('hello', temperature=0) == 'answer 1'
+    assert embedded == ['hello']
+    time.sleep(0.1)
+    # the exact entry expired: its own embedding must not serve it again
+    assert client.generate('hello', temperature=0) == 'answer 2'
+    assert embedded == ['hello', 'hello']
+
+
+def test_exact_cache_keys_positional_arguments():
+    cache = LLMCache()
+    calls = []
+
+    class Client:
+        model_name = 'model'
+
+        @cache.memoize()
+        def generate(self, messages, system_prompt=None, **kwargs):
+            calls.append(system_prompt)
+            return f"{system_prompt} answer"
+
+    client = Client()
+    messages = [{'role': 'user', 'content': 'hi'}]
+    assert client.generate(messages, 'be terse', temperature=0) == 'be terse answer'
+    assert client.generate(messages, 'be verbose', temperature=0) == 'be verbose answer'
+    # positional or keyword, the same call shares its entry
+    assert client.generate(messages, system_prompt='be terse', temperature=0) == 'be terse answer'
+    assert calls == ['be terse', 'be verbose']
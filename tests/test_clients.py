@@ -0,0 +1,114 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('openai')
+
+from owl.api_clients.openai import OpenAIClient
+
+
+class ChatHandler(BaseHTTPRequestHandler):
+    # keep-alive, so that pooled connections outlive the first event loop
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        payload = json.dumps({
+            'id': 'chatcmpl-test',
+            'object': 'chat.completion',
+            'created': 0,
+            'model': body['model'],
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': body['messages'][-1]['content'].upper()},
+                'finish_reason': 'stop',
+            }],
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def chat_server(monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ChatHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key-generate-many')
+    monkeypatch.setenv('OPENAI_BASE_URL', f'http://127.0.0.1:{server.server_port}/v1')
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_openai_generate_many_twice(chat_server):
+    client = OpenAIClient('model')
+    prompts = [[{'role': 'user', 'content': 'a'}], [{'role': 'user', 'content': 'b'}]]
+    # each generate_many runs its own event loop: the async client must follow it
+    assert client.generate_many(prompts) == ['A', 'B']
+    assert client.generate_many(prompts) == ['A', 'B']
+
+
+class FakeBatchApi:
+    """
+    Stands in for the files/batches surface of the SDK client.
+    """
+    def __init__(self, output_lines, error_lines):
+        self.contents = {'out': output_lines, 'err': error_lines}
+        self.files = self
+        self.batches = self
+
+    def create(self, **kwargs):
+        # serves both files.create and batches.create
+        return SimpleNamespace(
+            id='batch', status='completed',
+            output_file_id='out' if self.contents['out'] else None,
+            error_file_id='err' if self.contents['err'] else None
+        )
+
+    def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, status='completed')
+
+    def content(self, file_id):
+        return SimpleNamespace(text="\n".join(json.dumps(line) for line in self.contents[file_id]))
+
+
+def batch_line(custom_id, status_code, content=None):
+    body = {'choices': [{'message': {'content': content}}]} if status_code == 200 else {'error': 'boom'}
+    return {'custom_id': custom_id, 'response': {'status_code': status_code, 'body': body}, 'error': None}
+
+
+def make_batch_client(monkeypatch, output_lines, error_lines):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key-batch')
+    client = OpenAIClient('model')
+    client.retrying_client = FakeBatchApi(output_lines, error_lines)
+    return client
+
+
+def test_openai_batch_collects_results_in_order(monkeypatch):
+    client = make_batch_client(monkeypatch, [batch_line('1', 200, 'b'), batch_line('0', 200, 'a')], [])
+    assert client._generate_batch([[], []], poll_interval=0) == ['a', 'b']
+
+
+def test_openai_batch_raises_on_failed_requests(monkeypatch):
+    client = make_batch_client(monkeypatch, [batch_line('0', 200, 'a')], [batch_line('1', 500)])
+    with pytest.raises(RuntimeError, match='1 requests failed'):
+        client._generate_batch([[], []], poll_interval=0)
+    # every request failed: there is no output file at all
+    client = make_batch_client(monkeypatch, [], [batch_line('0', 429), batch_line('1', 500)])
+    with pytest.raises(RuntimeError, match='2 requests failed'):
+        client._generate_batch([[], []], poll_interval=0)
+
+
+def test_openai_batch_raises_on_missing_results(monkeypatch):
+    client = make_batch_client(monkeypatch, [batch_line('0', 200, 'a')], [])
+    with pytest.raises(RuntimeError, match='no result'):
+        client._generate_batch([[], []], poll_interval=0)
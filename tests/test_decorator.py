@@ -1,7 +1,8 @@
 import pytest
-from owl.decorator import node, workflow, get_registered_nodes, llm_node
+from owl.decorator import node, workflow, get_registered_nodes, get_registered_node, llm_node
 from owl.types import NodeInputType
 from owl.node import BaseNode, LlmNode
+from owl.errors import NodeConnectionError
 
 
 def test_node_decorator_and_registry():
@@ -19,11 +20,12 @@ def test_node_decorator_and_registry():
     assert 'test' in reg
     out = reg['test'].run({'m':3})
     assert out['n']==6
+    assert get_registered_node('test') is node_obj
+    with pytest.raises(TypeError):
+        reg['other'] = node_obj
 
 
 def test_workflow_decorator_validation():
-    from owl.node import BaseNode
-
     @node(
         name='n1',
         input_types=NodeInputType(required={'a':int}),
@@ -34,18 +36,29 @@ def test_workflow_decorator_validation():
 
     @node(
         name='n2',
-        input_types=NodeInputType(required={'c':int}),
+        input_types=NodeInputType(required={'b':int}),
         output_types=NodeInputType(required={'d':int})
     )
-    def n2(c): return {'d':c}
+    def n2(b): return {'d':b}
     assert isinstance(n2, BaseNode)
 
     @workflow('wf_test')
     def build(wf):
-        wf.add_node(n1).add_node(n2)
-    # Should raise orphans for n1 and n2
-    with pytest.raises(Exception):
-        build()
+        first = n1()
+        n2(first)
+
+    wf = build()
+    assert wf.run({'a': 1}) == {'b': 1, 'd': 1}
+
+    @workflow('wf_orphan')
+    def build_with_orphan(wf):
+        first = n1()
+        n2(first)
+        # called without inputs and feeding nothing
+        n2(alias='lonely')
+
+    with pytest.raises(NodeConnectionError, match='lonely'):
+        build_with_orphan()
 
 
 def test_llm_node_decorator_and_registry():
@@ -1,8 +1,10 @@
+import asyncio
 import pytest
 from owl.node import BaseNode
 from owl.types import NodeInputType
 from owl.errors import NodeValidationError, NodeConnectionError, NodeExecutionError
 from owl.node import LlmNode, get_client
+from owl.api_clients.base_client import BaseClient
 
 
 def dummy_fn(x: int) -> dict:
@@ -43,6 +45,11 @@ def test_validate_connection_success_and_failure(node_a, node_b):
         node_a.validate_connection(node_b)
 
 
+def test_arun_without_async_fn(node_a):
+    out = asyncio.run(node_a.arun({'x': 5}))
+    assert out == {'y': 6}
+
+
 def test_base_node_missing_run_fn():
     with pytest.raises(ValueError):
         BaseNode(
@@ -52,11 +59,54 @@ def test_base_node_missing_run_fn():
             run_fn=None
         )
 
+def test_cacheable_node_reuses_outputs():
+    calls = []
+    def counting_fn(x):
+        calls.append(x)
+        return {'y': x + 1}
+    node = BaseNode(
+        name='cached',
+        input_types=NodeInputType(required={'x': int}),
+        output_types=NodeInputType(required={'y': int}),
+        run_fn=counting_fn,
+        cacheable=True
+    )
+    assert node.run({'x': 1}) == {'y': 2}
+    assert node.run({'x': 1}) == {'y': 2}
+    assert node.run({'x': 2}) == {'y': 3}
+    assert calls == [1, 2]
+    # invalid inputs are never looked up nor stored
+    with pytest.raises(NodeValidationError):
+        node.run({'x': 'wrong'})
+    assert node.clone('other').cacheable
+
+
+def test_cache_key_tags_nested_types():
+    node = BaseNode(
+        name='echo',
+        input_types=NodeInputType(required={'v': object}),
+        output_types=NodeInputType(required={'out': str}),
+        run_fn=lambda v: {'out': repr(v)},
+        cacheable=True
+    )
+    assert node.run({'v': (1,)}) == {'out': '(1,)'}
+    assert node.run({'v': (True,)}) == {'out': '(True,)'}
+    assert node.run({'v': [{'role': 'user', 'content': 1.0}]}) == {'out': "[{'role': 'user', 'content': 1.0}]"}
+    assert node.run({'v': [{'role': 'user', 'content': 1}]}) == {'out': "[{'role': 'user', 'content': 1}]"}
+
+
 class DummyClient:
     def __init__(self, response):
         self.response = response
     def generate(self, messages, **kwargs):
         return self.response
+    async def agenerate(self, messages, **kwargs):
+        return self.response
+    def generate_many(self, messages_list, **kwargs):
+        return [self.response] * len(messages_list)
+    def generate_stream(self, messages, **kwargs):
+        yield self.response[:4]
+        yield self.response[4:]
 
 @pytest.fixture(autouse=True)
 def patch_get_client(monkeypatch):
@@ -78,6 +128,99 @@ def test_llm_node_success():
     result = llm_node.run({'messages': ['hello']})
     assert result == {'reply': 'generated text'}
 
+def test_llm_node_arun():
+    llm_node = LlmNode(
+        name='llm',
+        input_types=NodeInputType(required={'messages': list}),
+        output_types=NodeInputType(required={'reply': str}),
+        provider='test',
+        model_name='model'
+    )
+
+    async def fan_out():
+        return await asyncio.gather(*[llm_node.arun({'messages': ['hello']}) for _ in range(3)])
+
+    assert asyncio.run(fan_out()) == [{'reply': 'generated text'}] * 3
+
+def test_llm_node_run_many():
+    llm_node = LlmNode(
+        name='llm',
+        input_types=NodeInputType(required={'messages': list}),
+        output_types=NodeInputType(required={'reply': str}),
+        provider='test',
+        model_name='model'
+    )
+    results = llm_node.run_many([{'messages': ['hello']}, {'messages': ['bye']}])
+    assert results == [{'reply': 'generated text'}, {'reply': 'generated text'}]
+
+def test_llm_node_run_many_groups_extras_and_ignores_offline(monkeypatch):
+    class StrictClient(BaseClient):
+        # no **kwargs: an unexpected argument reaching agenerate raises TypeError
+        def generate(self, messages, system_prompt=None, temperature=None):
+            return f"{messages[0]} {temperature}"
+
+        async def agenerate(self, messages, system_prompt=None, temperature=None):
+            return f"{messages[0]} {temperature}"
+
+    monkeypatch.setattr('owl.node.get_client', lambda p, m: StrictClient(m))
+    llm_node = LlmNode(
+        name='llm',
+        input_types=NodeInputType(required={'messages': list}, optional={'temperature': float}),
+        output_types=NodeInputType(required={'reply': str}),
+        provider='test',
+        model_name='model'
+    )
+    inputs_list = [
+        {'messages': ['a'], 'temperature': 0.0},
+        {'messages': ['b'], 'temperature': 1.0},
+        {'messages': ['c'], 'temperature': 0.0},
+    ]
+    # offline/poll_interval only matter to clients with a batch API
+    results = llm_node.run_many(inputs_list, offline=True, poll_interval=1.0)
+    assert results == [{'reply': 'a 0.0'}, {'reply': 'b 1.0'}, {'reply': 'c 0.0'}]
+
+def test_llm_node_stream():
+    llm_node = LlmNode(
+        name='llm',
+        input_types=NodeInputType(required={'messages': list}),
+        output_types=NodeInputType(required={'reply': str}),
+        provider='test',
+        model_name='model',
+        stream=True
+    )
+    assert llm_node.run({'messages': ['hello']}) == {'reply': 'generated text'}
+    with pytest.raises(ValueError):
+        LlmNode(
+            name='llm',
+            input_types=NodeInputType(required={'messages': list}),
+            output_types=NodeInputType(required={'reply': list}),
+            provider='test',
+            model_name='model',
+            stream=True
+        )
+
+def test_llm_node_passes_system_prompt_to_client(monkeypatch):
+    sent = []
+    class RecordingClient(DummyClient):
+        def generate(self, messages, **kwargs):
+            sent.append((messages, kwargs))
+            return self.response
+    monkeypatch.setattr('owl.node.get_client', lambda p, m: RecordingClient("ok"))
+    llm_node = LlmNode(
+        name='llm',
+        input_types=NodeInputType(required={'messages': list}),
+        output_types=NodeInputType(required={'reply': str}),
+        provider='test',
+        model_name='model',
+        system_prompt='You translate.'
+    )
+    llm_node.run({'messages': [{'role': 'user', 'content': 'hello'}]})
+    # the client decides where the system prompt goes for its API
+    assert sent == [(
+        [{'role': 'user', 'content': 'hello'}],
+        {'system_prompt': 'You translate.'},
+    )]
+
 def test_llm_node_missing_messages():
     input_types = NodeInputType(required={'messages': list})
     output_types = NodeInputType(required={'reply': str})
@@ -108,6 +251,23 @@ def test_llm_node_execution_error(monkeypatch):
     with pytest.raises(NodeExecutionError):
         llm_node.run({'messages': ['hello']})
 
+def test_llm_node_rejects_non_str_content(monkeypatch):
+    # e.g. OpenAI returns content=None on refusals and tool calls
+    monkeypatch.setattr('owl.node.get_client', lambda p, m: DummyClient(None))
+    llm_node = LlmNode(
+        name='llm',
+        input_types=NodeInputType(required={'messages': list}),
+        output_types=NodeInputType(required={'reply': str}),
+        provider='test',
+        model_name='model'
+    )
+    with pytest.raises(NodeValidationError):
+        llm_node.run({'messages': ['hello']})
+    with pytest.raises(NodeValidationError):
+        asyncio.run(llm_node.arun({'messages': ['hello']}))
+    with pytest.raises(NodeValidationError):
+        llm_node.run_many([{'messages': ['hello']}])
+
 def test_llm_node_multiple_output_keys():
     input_types = NodeInputType(required={'messages': list})
     output_types = NodeInputType(required={'a': str, 'b': str})
@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from owl.api_clients import retry
+from owl.api_clients.retry import retry_llm
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(retry.time, 'sleep', lambda delay: None)
+
+
+def test_retry_on_rate_limit_then_succeed():
+    attempts = []
+
+    @retry_llm(max_attempts=3)
+    def generate():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeStatusError(429)
+        return 'ok'
+
+    assert generate() == 'ok'
+    assert len(attempts) == 3
+
+
+def test_no_retry_on_client_error():
+    attempts = []
+
+    @retry_llm(max_attempts=3)
+    def generate():
+        attempts.append(1)
+        raise FakeStatusError(400)
+
+    with pytest.raises(FakeStatusError):
+        generate()
+    assert len(attempts) == 1
+
+
+class FakeHeaderError(FakeStatusError):
+    def __init__(self, status_code, headers):
+        super().__init__(status_code)
+        self.response = SimpleNamespace(headers=headers)
+
+
+@pytest.mark.parametrize('headers, expected', [
+    ({'retry-after': '2'}, 2.0),
+    ({'retry-after-ms': '250', 'retry-after': '2'}, 0.25),
+    ({'x-ratelimit-remaining-requests': '0', 'x-ratelimit-reset-requests': '1.5s'}, 1.5),
+    ({'x-ratelimit-remaining-tokens': '0', 'x-ratelimit-reset-tokens': '20ms'}, 0.02),
+])
+def test_delay_follows_provider_headers(headers, expected):
+    assert retry._delay(FakeHeaderError(429, headers), 0, 0.1, 8.0) == pytest.approx(expected)
+
+
+def test_delay_caps_retry_after():
+    # an hour-long Retry-After falls back to the capped backoff
+    delay = retry._delay(FakeHeaderError(429, {'retry-after': '3600'}), 2, 0.1, 8.0)
+    assert 0 <= delay <= 0.4
+
+
+def test_async_retry_waits_retry_after(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr(retry.asyncio, 'sleep', fake_sleep)
+    attempts = []
+
+    @retry_llm(max_attempts=3)
+    async def agenerate():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeHeaderError(429, {'retry-after': '1.5'})
+        return 'ok'
+
+    assert asyncio.run(agenerate()) == 'ok'
+    assert delays == [1.5, 1.5]
@@ -33,3 +33,31 @@ def test_validate_success_and_failure():
     # Wrong type
     with pytest.raises(NodeValidationError):
         nit.validate({'a': 'not int'})
+
+
+def test_validate_follows_added_and_removed_inputs():
+    nit = NodeInputType(required={'a': int})
+    nit.add_input('b', str)
+    with pytest.raises(NodeValidationError):
+        nit.validate({'a': 1})
+    nit.remove_input('b')
+    nit.validate({'a': 1})
+    # subclasses still pass the isinstance fallback
+    nit.validate({'a': True})
+
+
+def test_validate_keys_that_are_not_identifiers():
+    nit = NodeInputType(required={'user-id': int}, optional={'class': str})
+    nit.validate({'user-id': 1})
+    nit.validate({'user-id': 1, 'class': 'x'})
+    with pytest.raises(NodeValidationError, match="'user-id'"):
+        nit.validate({})
+    with pytest.raises(NodeValidationError, match="Optional Input 'class'"):
+        nit.validate({'user-id': 1, 'class': 2})
+
+
+def test_node_input_type_is_slotted():
+    nit = NodeInputType(required={'a': int})
+    assert not hasattr(nit, '__dict__')
+    with pytest.raises(AttributeError):
+        nit.extra = 1
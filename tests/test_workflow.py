@@ -1,8 +1,11 @@
+import asyncio
+import logging
 import pytest
 from owl.workflow import Workflow
-from owl.node import BaseNode
+from owl.node import BaseNode, NodeCall
 from owl.types import NodeInputType
-from owl.errors import NodeConnectionError
+from owl.errors import NodeConnectionError, NodeValidationError
+from owl.logger import OrchestratorLogger
 
 
 def make_node(name, in_key, out_key):
@@ -33,3 +36,146 @@ def test_workflow_cycle_detection():
     wf.connect(b, a)
     with pytest.raises(NodeConnectionError):
         wf.run({'x': 0})
+
+
+def test_workflow_topological_order_is_cached():
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'y', 'z')
+    with Workflow('cached') as wf:
+        call_a = a()
+        b(call_a)
+    ordered = wf._topological_sort()
+    assert wf._topological_sort() is ordered
+    assert wf.run({'x': 1})['z'] == 3
+    with wf:
+        b(call_a, alias='b2')
+    assert len(wf._topological_sort()) == 3
+
+
+def test_workflow_arun_matches_run():
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'y', 'z')
+    with Workflow('parallel') as wf:
+        call_a = a()
+        b(call_a, alias='left')
+        b(call_a, alias='right')
+    expected = {'y': 2, 'left_z': 3, 'right_z': 3}
+    assert wf.run({'x': 1}) == expected
+    assert asyncio.run(wf.arun({'x': 1})) == expected
+
+
+def test_workflow_reorders_calls_registered_before_their_inputs():
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'y', 'z')
+    call_a = NodeCall(a, [])
+    call_b = NodeCall(b, [call_a])
+    wf = Workflow('reorder')
+    wf.register_call(call_b)
+    wf.register_call(call_a)
+    assert wf._topological_sort() == (call_a, call_b)
+    assert wf.run({'x': 1})['z'] == 3
+    with pytest.raises(NodeConnectionError):
+        wf.register_call(call_a)
+
+
+def test_workflow_cycle_detected_on_registration():
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'y', 'x')
+    call_a = NodeCall(a, [])
+    call_b = NodeCall(b, [call_a])
+    call_a.inputs.append(call_b)
+    wf = Workflow('cycle_calls')
+    wf.register_call(call_a)
+    with pytest.raises(NodeConnectionError):
+        wf.register_call(call_b)
+    with pytest.raises(NodeConnectionError):
+        wf.run({'x': 0})
+
+
+def test_workflow_validation_errors_from_inner_calls():
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'w', 'z')
+    with Workflow('mismatch') as wf:
+        b(a())
+    with pytest.raises(NodeValidationError):
+        wf.run({'x': 'not int'})
+    with pytest.raises(NodeValidationError):
+        wf.run({'x': 1})
+
+
+def test_workflow_generations_group_independent_calls():
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'y', 'z')
+    with Workflow('generations') as wf:
+        call_a = a()
+        left = b(call_a, alias='left')
+        right = b(call_a, alias='right')
+    assert wf._topological_generations() == ((call_a,), (left, right))
+    assert wf.run({'x': 1}) == wf.run({'x': 1}, max_workers=1)
+
+
+def test_workflow_warns_on_output_key_collision(caplog):
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'y', 'z')
+    # the owl logger does not propagate: listen on it directly
+    logger = OrchestratorLogger.get_logger()
+    logger.addHandler(caplog.handler)
+    try:
+        with Workflow('keys'):
+            call_a = a()
+            b(call_a, alias='left')
+            first = b(call_a)
+            assert not caplog.records
+            second = b(call_a)
+    finally:
+        logger.removeHandler(caplog.handler)
+    warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "'z'" in warnings[0].getMessage()
+    assert str(first) in warnings[0].getMessage() and str(second) in warnings[0].getMessage()
+
+
+def test_workflow_pretty_print_starts_from_roots(capsys):
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'y', 'z')
+    with Workflow('tree') as wf:
+        call_a = a()
+        b(call_a, alias='left')
+        b(call_a, alias='right')
+    wf.pretty_print()
+    assert capsys.readouterr().out.splitlines() == [
+        "<NodeCall a>",
+        "├── <NodeCall b as 'left'>",
+        "└── <NodeCall b as 'right'>",
+    ]
+
+
+def test_workflow_rejects_unregistered_inputs():
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'y', 'z')
+    outside = NodeCall(a, [])
+    with Workflow('unregistered') as wf:
+        b(outside)
+    with pytest.raises(NodeConnectionError):
+        wf.run({'x': 1})
+    with pytest.raises(NodeConnectionError):
+        asyncio.run(wf.arun({'x': 1}))
+
+
+def test_workflow_pretty_print_diamond_prints_shared_call_once(capsys):
+    a = make_node('a', 'x', 'y')
+    b = make_node('b', 'y', 'z')
+    d = make_node('d', 'z', 'w')
+    with Workflow('diamond') as wf:
+        call_a = a()
+        left = b(call_a, alias='left')
+        right = b(call_a, alias='right')
+        d(left, right)
+    wf.pretty_print()
+    assert capsys.readouterr().out.splitlines() == [
+        "<NodeCall a>",
+        "├── <NodeCall b as 'left'>",
+        "│   └── <NodeCall d>",
+        "└── <NodeCall b as 'right'>",
+        "    └── <NodeCall d> (see above)",
+    ]
@@ -1,4 +1,9 @@
-from typing import Dict, Any, List, Optional, Set
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from graphlib import TopologicalSorter
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple
+from .core_type import _typecheck
 from .node import NodeCall
 from .errors import NodeConnectionError, NodeValidationError, NodeExecutionError
 from .logger import OrchestratorLogger
@@ -13,6 +18,21 @@ class Workflow:
         self.name = name
         self.calls: List[NodeCall] = []
         self.logger = OrchestratorLogger.get_logger()
+        # incremental topological order (Pearce-Kelly): _order[_n2i[call]] is call
+        self._order: List[NodeCall] = []
+        self._n2i: Dict[NodeCall, int] = {}
+        self._downstream: Dict[NodeCall, List[NodeCall]] = {}
+        self._upstream: Dict[NodeCall, List[NodeCall]] = {}
+        # edges whose upstream call is not registered yet, keyed by that upstream
+        self._waiting: Dict[NodeCall, List[NodeCall]] = {}
+        self._cyclic: bool = False
+        # immutable snapshot of _order; None whenever the graph changed since
+        self._cached_order: Optional[Tuple[NodeCall, ...]] = None
+        self._cached_generations: Optional[Tuple[Tuple[NodeCall, ...], ...]] = None
+        # per-call required (key, type) pairs, snapshotted at registration for run()
+        self._required_items: Dict[NodeCall, Tuple[Tuple[str, type], ...]] = {}
+        # output key (after alias renaming) -> last registered call producing it
+        self._produced_keys: Dict[str, NodeCall] = {}
 
     def __enter__(self) -> "Workflow":
         Workflow.current = self
@@ -24,121 +44,310 @@ class Workflow:
     def register_call(self, call: NodeCall) -> None:
         """
         Register a newly created NodeCall in this workflow.
+        The topological order is updated incrementally, raising
+        NodeConnectionError as soon as an edge closes a cycle.
         """
+        if call in self._n2i:
+            raise NodeConnectionError(f"{call} is already registered in workflow {self.name}.")
         self.calls.append(call)
+        self._n2i[call] = len(self._order)
+        self._order.append(call)
+        self._downstream[call] = []
+        self._upstream[call] = []
+        self._required_items[call] = tuple(call.input_types.required.items())
+        self._cached_order = None
+        self._cached_generations = None
+        self._record_output_keys(call)
+        for upstream in call.get_inputs():
+            if upstream in self._n2i:
+                self._add_edge(upstream, call)
+            else:
+                self._waiting.setdefault(upstream, []).append(call)
+        for downstream in self._waiting.pop(call, []):
+            self._add_edge(call, downstream)
 
-    def _build_adjacency(self) -> Dict[NodeCall, List[NodeCall]]:
+    def _record_output_keys(self, call: NodeCall) -> None:
         """
-        Build adjacency mapping from each call to its downstream calls.
+        Report output keys already produced by another call, once, at build time.
+        run() merges outputs with dict.update, so only one value survives per key.
         """
-        adj: Dict[NodeCall, List[NodeCall]] = {call: [] for call in self.calls}
-        for call in self.calls:
-            for upstream in call.get_inputs():
-                if upstream in adj:
-                    adj[upstream].append(call)
-        return adj
+        rename = call._alias_rename
+        keys = rename.values() if rename is not None else call.prototype.get_output_keys()
+        for key in keys:
+            previous = self._produced_keys.get(key)
+            if previous is not None:
+                self.logger.warning(
+                    "Output key '%s' of %s is also produced by %s in workflow %s; use an alias to keep both.",
+                    key, call, previous, self.name
+                )
+            self._produced_keys[key] = call
 
-    def _topological_sort(self) -> List[NodeCall]:
+    def _add_edge(self, src: NodeCall, dst: NodeCall) -> None:
         """
-        Return a topologically sorted list of NodeCall based on dependencies.
+        Add the edge src -> dst and restore the topological order (Pearce-Kelly).
+        Only the calls between dst and src in the current order are visited.
         """
-        adj = self._build_adjacency()
-        in_degree: Dict[NodeCall, int] = {call: 0 for call in self.calls}
-        for src, dests in adj.items():
-            for dst in dests:
-                in_degree[dst] += 1
+        self._downstream[src].append(dst)
+        self._upstream[dst].append(src)
+        lower, upper = self._n2i[dst], self._n2i[src]
+        if lower > upper:
+            return
 
-        queue = [c for c, deg in in_degree.items() if deg == 0]
-        ordered: List[NodeCall] = []
-        while queue:
-            node = queue.pop(0)
-            ordered.append(node)
-            for downstream in adj.get(node, []):
-                in_degree[downstream] -= 1
-                if in_degree[downstream] == 0:
-                    queue.append(downstream)
+        # calls reachable from dst that currently sit before src
+        forward: Set[NodeCall] = set()
+        stack = [dst]
+        while stack:
+            node = stack.pop()
+            if node is src:
+                self._cyclic = True
+                self.logger.error("Cycle detected in the workflow")
+                raise NodeConnectionError(f"Cycle detected in the workflow: {src} -> {dst}.")
+            if node in forward:
+                continue
+            forward.add(node)
+            stack.extend(d for d in self._downstream[node] if self._n2i[d] <= upper)
 
-        if len(ordered) != len(self.calls):
-            self.logger.error("Cycle detected in the workflow")
+        # calls reaching src that currently sit after dst
+        backward: Set[NodeCall] = set()
+        stack = [src]
+        while stack:
+            node = stack.pop()
+            if node in backward:
+                continue
+            backward.add(node)
+            stack.extend(u for u in self._upstream[node] if self._n2i[u] >= lower)
+
+        # ancestors of src move before descendants of dst, reusing the same slots
+        affected = sorted(backward, key=self._n2i.__getitem__) + sorted(forward, key=self._n2i.__getitem__)
+        slots = sorted(self._n2i[node] for node in affected)
+        for node, idx in zip(affected, slots):
+            self._n2i[node] = idx
+            self._order[idx] = node
+
+    def _topological_sort(self) -> Tuple[NodeCall, ...]:
+        """
+        Return a topologically sorted tuple of NodeCall based on dependencies.
+        The order is maintained by register_call; this only snapshots it.
+        """
+        if self._cyclic:
             raise NodeConnectionError("Cycle detected in the workflow.")
-        return ordered
+        if self._waiting:
+            dependents = [call for calls in self._waiting.values() for call in calls]
+            raise NodeConnectionError(
+                f"Calls {dependents} depend on calls not registered in workflow {self.name}."
+            )
+        if self._cached_order is None:
+            self._cached_order = tuple(self._order)
+        return self._cached_order
+
+    def _topological_generations(self) -> Tuple[Tuple[NodeCall, ...], ...]:
+        """
+        Group calls into generations (graphlib.TopologicalSorter): every call of a
+        generation only depends on calls of earlier generations.
+        The result is cached until a new call is registered.
+        """
+        if self._cached_generations is None:
+            ordered = self._topological_sort()
+            # register_call already rejected cycles, and _topological_sort raised if one was found
+            sorter = TopologicalSorter({call: self._upstream[call] for call in ordered})
+            sorter.prepare()
+            generations: List[Tuple[NodeCall, ...]] = []
+            while sorter.is_active():
+                # get_ready order is unspecified: keep the registration-based order
+                generation = tuple(sorted(sorter.get_ready(), key=self._n2i.__getitem__))
+                generations.append(generation)
+                sorter.done(*generation)
+            self._cached_generations = tuple(generations)
+        return self._cached_generations
 
     def pretty_print(self) -> None:
         """
         Display the workflow structure as an ASCII tree of NodeCalls.
         """
-        adj = self._build_adjacency()
-        # identify roots: calls with no upstream
-        all_calls = set(self.calls)
-        non_roots = {c for call in self.calls for c in call.get_inputs()}
-        roots = [c for c in self.calls if c not in non_roots]
-
-        def _rec(call: NodeCall, prefix: str, visited: Set[NodeCall], is_last: bool):
-            if call in visited:
-                print(prefix + ("└── " if is_last else "├── ") + f"{call} (cycle)")
-                return
-            visited.add(call)
-            branch = "└── " if is_last else "├── "
-            print(prefix + branch + f"{call}")
-            children = adj.get(call, [])
-            new_prefix = prefix + ("    " if is_last else "│   ")
-            for idx, child in enumerate(children):
-                _rec(child, new_prefix, visited.copy(), idx == len(children) - 1)
-
-        for idx, root in enumerate(roots):
+        # downstream adjacency, kept up to date by register_call
+        adj = self._downstream
+        # identify roots: calls with no registered upstream, in a single pass
+        roots = [c for c in self.calls if not self._upstream[c]]
+
+        # printed: calls already expanded once; on_path: ancestors of the current call
+        printed: Set[NodeCall] = set()
+        on_path: Set[NodeCall] = set()
+
+        for root in roots:
             print(f"{root}")
+            printed.add(root)
+            on_path.add(root)
+            # explicit stack of (call, prefix, is_last, leaving); leaving entries pop a call off the path
+            stack: List[Tuple[NodeCall, str, bool, bool]] = [(root, '', True, True)]
             children = adj.get(root, [])
-            for jdx, child in enumerate(children):
-                _rec(child, '', set([root]), jdx == len(children) - 1)
+            for idx in range(len(children) - 1, -1, -1):
+                stack.append((children[idx], '', idx == len(children) - 1, False))
+
+            while stack:
+                call, prefix, is_last, leaving = stack.pop()
+                if leaving:
+                    on_path.discard(call)
+                    continue
+                branch = "└── " if is_last else "├── "
+                if call in on_path:
+                    print(prefix + branch + f"{call} (cycle)")
+                    continue
+                if call in printed:
+                    print(prefix + branch + f"{call} (see above)")
+                    continue
+                printed.add(call)
+                print(prefix + branch + f"{call}")
+                on_path.add(call)
+                stack.append((call, prefix, is_last, True))
+                children = adj.get(call, [])
+                new_prefix = prefix + ("    " if is_last else "│   ")
+                # pushed in reverse so children print in their original order
+                for idx in range(len(children) - 1, -1, -1):
+                    stack.append((children[idx], new_prefix, idx == len(children) - 1, False))
 
-    def run(self, initial_inputs: Dict[str, Any]) -> Dict[str, Any]:
+    def _gather_inputs(
+        self,
+        call: NodeCall,
+        memo: Dict[NodeCall, Dict[str, Any]],
+        initial_inputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build the inputs of a call from its upstream outputs (or initial_inputs for roots,
+        whose required keys are validated here).
+        """
+        # gather inputs from upstream calls; nodes never mutate their inputs
+        # (run_fn gets fresh **kwargs), so a single source is passed without copy
+        upstream_calls = call.get_inputs()
+        if len(upstream_calls) == 1:
+            inputs = memo[upstream_calls[0]]
+        elif upstream_calls:
+            inputs = {}
+            for upstream in upstream_calls:
+                inputs.update(memo[upstream])
+        # for calls without inputs, feed initial_inputs
+        else:
+            inputs = initial_inputs
+
+            # initial_inputs come from the caller: check them here with a precise message.
+            # Downstream calls are validated by their node's own run.
+            # one dict lookup per key: the KeyError path is the rare one
+            for key, expected_type in self._required_items[call]:
+                try:
+                    value = inputs[key]
+                except KeyError:
+                    raise NodeValidationError(f"Missing required input '{key}' for {call}") from None
+                if not _typecheck(value, expected_type):
+                    raise NodeValidationError(f"Input '{key}' for {call} expected {expected_type}, got {type(value)}")
+        return inputs
+
+    def _namespace_output(self, call: NodeCall, output: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply alias namespacing to a call output, if the call has an alias.
+        """
+        rename = call._alias_rename
+        if rename is not None:
+            # keys outside output_types (e.g. passed through by an InputNode) are renamed on the fly
+            output = {rename.get(k) or f"{call.alias}_{k}": v for k, v in output.items()}
+        self.logger.debug("%s produced %s", call, output)
+        return output
+
+    def _merge_outputs(
+        self,
+        ordered_calls: Sequence[NodeCall],
+        memo: Dict[NodeCall, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Merge all call outputs in topological order.
+        """
+        # merge all outputs, later calls win on shared keys
+        final: Dict[str, Any] = {}
+        for call in ordered_calls:
+            final.update(memo[call])
+
+        self.logger.info("Workflow %s completed with results: %s", self.name, final)
+        return final
+
+    def _run_call(
+        self,
+        call: NodeCall,
+        memo: Dict[NodeCall, Dict[str, Any]],
+        initial_inputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        inputs = self._gather_inputs(call, memo, initial_inputs)
+        try:
+            output = call.prototype.run(inputs)
+        except NodeValidationError:
+            raise
+        except Exception as e:
+            self.logger.error("Error running %s: %s", call, e)
+            raise NodeExecutionError(f"Error running {call}: {e}")
+        return self._namespace_output(call, output)
+
+    def run(self, initial_inputs: Dict[str, Any], max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Execute the workflow, feeding initial_inputs into input nodes.
-        Returns a dict aggregating all outputs, raising on key collisions.
+        Calls of the same topological generation have no dependency between them
+        and run in a thread pool (I/O-bound LLM calls overlap); pass max_workers=1
+        to run every call sequentially.
+        Returns a dict aggregating all outputs; on shared keys the later call wins
+        (such collisions are reported when calls are registered).
         """
         # topologically order calls
         ordered_calls = self._topological_sort()
+        generations = self._topological_generations()
         memo: Dict[NodeCall, Dict[str, Any]] = {}
-        self.logger.info(
-                        "Topological order: " + " → ".join(str(c) for c in ordered_calls)
-                    )
-        for call in ordered_calls:
-            # gather inputs from upstream calls
-            inputs: Dict[str, Any] = {}
-            for upstream in call.get_inputs():
-                inputs.update(memo[upstream])
-            # for calls without inputs, feed initial_inputs
-            if not call.get_inputs():
-                inputs.update(initial_inputs)
-
-            # validate required keys
-            for key, expected_type in call.input_types.required.items():
-                if key not in inputs:
-                    raise NodeValidationError(f"Missing required input '{key}' for {call}")
-                if not isinstance(inputs[key], expected_type):
-                    raise NodeValidationError(f"Input '{key}' for {call} expected {expected_type}, got {type(inputs[key])}")
-
-            # execute node
-            try:
-                output = call.prototype.run(inputs)
-            except Exception as e:
-                self.logger.error(f"Error running {call}: {e}")
-                raise NodeExecutionError(f"Error running {call}: {e}")
-
-            # apply alias namespacing if present
-            if call.alias:
-                output = {f"{call.alias}_{k}": v for k, v in output.items()}
-
-            memo[call] = output
-            self.logger.debug(f"{call} produced {output}")
-
-        # merge all outputs, detect collisions
-        final: Dict[str, Any] = {}
-        for out in memo.values():
-            for k, v in out.items():
-                #if k in final:
-                #    raise NodeConnectionError(f"Final collision on output key '{k}'")
-                final[k] = v
+        # the join walks every call: skip it when INFO is filtered out
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Topological order: %s", " → ".join(str(c) for c in ordered_calls))
+        widest = max((len(generation) for generation in generations), default=1)
+        workers = max_workers or min(32, widest)
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 and widest > 1 else None
+        try:
+            for generation in generations:
+                # workers only read memo entries of earlier generations;
+                # memo is written here, in the calling thread, between generations
+                if executor is None or len(generation) == 1:
+                    outputs = [self._run_call(call, memo, initial_inputs) for call in generation]
+                else:
+                    outputs = list(executor.map(
+                        lambda call: self._run_call(call, memo, initial_inputs), generation
+                    ))
+                memo.update(zip(generation, outputs))
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
-        self.logger.info(f"Workflow {self.name} completed with results: {final}")
-        return final
+        return self._merge_outputs(ordered_calls, memo)
+
+    async def _arun_call(
+        self,
+        call: NodeCall,
+        memo: Dict[NodeCall, Dict[str, Any]],
+        initial_inputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        inputs = self._gather_inputs(call, memo, initial_inputs)
+        try:
+            output = await call.prototype.arun(inputs)
+        except NodeValidationError:
+            raise
+        except Exception as e:
+            self.logger.error("Error running %s: %s", call, e)
+            raise NodeExecutionError(f"Error running {call}: {e}")
+        return self._namespace_output(call, output)
+
+    async def arun(self, initial_inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of run. The calls of each topological generation (the same
+        schedule as run) are awaited concurrently, so independent branches overlap
+        instead of running one after the other (LLM calls stay bounded by the client semaphore).
+        Returns the same aggregated dict as run.
+        """
+        ordered_calls = self._topological_sort()
+        memo: Dict[NodeCall, Dict[str, Any]] = {}
+        for generation in self._topological_generations():
+            outputs = await asyncio.gather(
+                *[self._arun_call(call, memo, initial_inputs) for call in generation]
+            )
+            memo.update(zip(generation, outputs))
+
+        return self._merge_outputs(ordered_calls, memo)